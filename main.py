@@ -1,22 +1,84 @@
-from models.llm_only import llm_only_answer
-from models.llm_with_json import llm_with_json_answer
+import asyncio
+import logging
+import os
+import sys
 
 
-def main():
+def print_answers(llm_ans, rag_ans):
+    print("\n LLM-only answer")
+    print(llm_ans)
+
+    print("\n LLM+JSON answer")
+    print(rag_ans)
+
+    print("\n" + "=" * 60 + "\n")
+
+
+async def run_batch(questions):
+    from models.llm_only import llm_only_answers_batch
+    from models.llm_with_json import llm_with_json_answers_batch
+
+    # All questions go out up front; requests overlap up to the client concurrency limit
+    llm_answers, rag_answers = await asyncio.gather(
+        llm_only_answers_batch(questions), llm_with_json_answers_batch(questions)
+    )
+    for q, llm_ans, rag_ans in zip(questions, llm_answers, rag_answers):
+        print(f"Question: {q}")
+        # Failures come back per question; report them without losing the other answers
+        print_answers(*(
+            f"Error: {ans!r}" if isinstance(ans, BaseException) else ans
+            for ans in (llm_ans, rag_ans)
+        ))
+
+
+async def main():
     print("=== Grounded QA System (LLM-only vs LLM+RAG) ===\n")
+
+    if len(sys.argv) > 1:
+        await run_batch(sys.argv[1:])
+        return
+
+    # Deferred so the banner shows before the OpenAI SDK is imported and the key is checked
+    from models.llm_only import llm_only_answer
+    from models.llm_with_json import llm_with_json_answer_stream
+
     while True:
         q = input("Enter your question (or 'exit'): ")
         if q.lower() == "exit":
             break
 
-        print("\n LLM-only answer")
-        print(llm_only_answer(q))
+        # Both pipelines are independent API round-trips, so run them concurrently:
+        # pulling the first RAG chunk starts parse/retrieve/generation right away
+        llm_task = asyncio.create_task(llm_only_answer(q))
+        rag_chunks = llm_with_json_answer_stream(q)
+        first_chunk = asyncio.ensure_future(anext(rag_chunks, ""))
+
+        try:
+            print("\n LLM-only answer")
+            print(await llm_task)
 
-        print("\n LLM+JSON answer")
-        print(llm_with_json_answer(q))
+            # Print the grounded answer as it is generated
+            print("\n LLM+JSON answer")
+            print(await first_chunk, end="", flush=True)
+            async for chunk in rag_chunks:
+                print(chunk, end="", flush=True)
+            print()
+        finally:
+            # If either side failed, stop the prefetch and close the half-read stream
+            first_chunk.cancel()
+            await asyncio.gather(first_chunk, return_exceptions=True)
+            await rag_chunks.aclose()
 
         print("\n" + "=" * 60 + "\n")
 
 
 if __name__ == "__main__":
-    main()
+    # Pipeline steps are logged at DEBUG; run with LOG_LEVEL=DEBUG to trace them.
+    # Third-party loggers (openai, httpx) stay at WARNING
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    level = logging.getLevelName(os.getenv("LOG_LEVEL", "WARNING").upper())
+    if not isinstance(level, int):
+        level = logging.WARNING
+    for name in ("utils", "models"):
+        logging.getLogger(name).setLevel(level)
+    asyncio.run(main())
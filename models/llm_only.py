@@ -1,8 +1,20 @@
-from utils.api_client import client
+from utils.api_client import cached_chat, gather_limited
 
+MODEL = "gpt-3.5-turbo"
+TEMPERATURE = 0
 
-def llm_only_answer(question):
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo", messages=[{"role": "user", "content": question}]
+
+async def llm_only_answer(question):
+    answer = await cached_chat(
+        [{"role": "user", "content": question}],
+        model=MODEL,
+        temperature=TEMPERATURE,
+    )
+    return answer.strip()
+
+
+async def llm_only_answers_batch(questions):
+    # A failed question yields its exception instead of discarding the whole batch
+    return await gather_limited(
+        (llm_only_answer(q) for q in questions), return_exceptions=True
     )
-    return resp.choices[0].message.content.strip()
@@ -1,35 +1,82 @@
 from utils.semantic_parser import parse_with_llm
-from utils.json_retriever import retrieve_info
-from utils.api_client import client
+from utils.json_retriever import load_catalog, retrieve_info
+from utils.api_client import gather_limited, stream_chat
+from utils import semantic_cache
+import asyncio
+import hashlib
 import json
+import logging
 
+logger = logging.getLogger(__name__)
 
-def llm_with_json_answer(question):
-    print("\n STEP 1: === Semantic Parsing ===")
-    parsed = parse_with_llm(question)
-    print("DEBUG- semantic parse →", parsed)
+MODEL = "gpt-3.5-turbo"
+TEMPERATURE = 0
 
-    print("\n STEP 2:=== JSON Retrieval ===")
-    retrieved = retrieve_info(parsed)
-    print("DEBUG- retrieved JSON slice →", retrieved)
+
+async def llm_with_json_answer_stream(question):
+    """
+    RAG pipeline that yields the generated answer in pieces as they arrive
+    """
+    logger.debug("STEP 1: === Semantic Parsing ===")
+    # The dataset read and the answer-cache embedding do not depend on the parse,
+    # so they overlap the LLM call (a failed embedding is just a cache miss)
+    parsed, catalog, vec = await asyncio.gather(
+        parse_with_llm(question),
+        asyncio.to_thread(load_catalog),
+        semantic_cache.try_embed(question),
+    )
+    logger.debug("semantic parse → %s", parsed)
+
+    logger.debug("STEP 2: === JSON Retrieval ===")
+    retrieved = retrieve_info(parsed, catalog)
+    logger.debug("retrieved JSON slice → %s", retrieved)
 
     if not retrieved:
-        return "No matching data found."
+        yield "No matching data found."
+        return
 
-    print("\n STEP 3: === Answer Generation ===")
+    # Only reuse answers generated from the same facts, so the cache respects the constraints
+    retrieved_key = hashlib.sha256(
+        json.dumps(retrieved, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    scope = f"answer:{retrieved_key}"
+    cached = semantic_cache.lookup(scope, vec)
+    if cached is not None:
+        logger.debug("semantic cache hit for answer")
+        yield cached
+        return
+
+    logger.debug("STEP 3: === Answer Generation ===")
+    # Compact JSON without empty fields: whitespace and nulls are billed tokens too
+    facts = {k: v for k, v in retrieved.items() if v is not None}
     prompt = (
         f"User question: {question}\n"
         f"Use ONLY the following factual data:\n"
-        f"{json.dumps(retrieved, indent=2)}\n"
+        f"{json.dumps(facts, ensure_ascii=False, separators=(',', ':'))}\n"
         "Generate a natural-language answer based on it."
     )
-    print("DEBUG- prompt sent to GPT:\n", prompt)
-    print("\n")
+    logger.debug("prompt sent to GPT:\n%s", prompt)
 
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}]
-    )
+    # Only complete, non-empty answers go into the semantic cache
+    async for delta in stream_chat(
+        [{"role": "user", "content": prompt}],
+        model=MODEL,
+        temperature=TEMPERATURE,
+        validate=lambda content: bool(content.strip()),
+        on_complete=lambda content: semantic_cache.insert(scope, vec, content.strip()),
+    ):
+        yield delta
 
-    answer = resp.choices[0].message.content.strip()
-    print("\n STEP 4: === Final Answer ===")
-    return answer
+    logger.debug("STEP 4: === Final Answer ===")
+
+
+async def llm_with_json_answer(question):
+    parts = [delta async for delta in llm_with_json_answer_stream(question)]
+    return "".join(parts).strip()
+
+
+async def llm_with_json_answers_batch(questions):
+    # A failed question yields its exception instead of discarding the whole batch
+    return await gather_limited(
+        (llm_with_json_answer(q) for q in questions), return_exceptions=True
+    )
@@ -1,11 +1,132 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
+import asyncio
+import httpx
+import hashlib
+import json
 import os
+import shelve
 
-load_dotenv()
+# Skip reading .env when the key is already in the environment (e.g. inherited by workers)
+if not os.getenv("OPENAI_API_KEY"):
+    load_dotenv(override=False)
 api_key = os.getenv("OPENAI_API_KEY")
 
 if not api_key:
     raise ValueError("No OPENAI_API_KEY found in .env")
 
-client = OpenAI(api_key=api_key)
+# Pooled HTTP/2 keep-alive connections: only the first request pays the TLS handshake
+client = AsyncOpenAI(
+    api_key=api_key,
+    http_client=DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    ),
+)
+
+# Upper bound on in-flight API requests when fanning out over many questions
+MAX_CONCURRENCY = 8
+
+CHAT_CACHE_PATH = ".cache/chat_cache"
+
+# Exact-match completion cache: in-process dict in front of an on-disk shelf
+_chat_memory = {}
+_chat_store = None
+
+
+async def gather_limited(coros, limit=MAX_CONCURRENCY, return_exceptions=False):
+    """
+    Await coroutines concurrently (at most `limit` at a time), keeping input order.
+    With return_exceptions=True a failure is returned in its slot, as in asyncio.gather
+    """
+    sem = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(
+        *(run(c) for c in coros), return_exceptions=return_exceptions
+    )
+
+
+def _chat_cache_key(messages, params):
+    payload = json.dumps({"messages": messages, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _open_chat_store():
+    global _chat_store
+    if _chat_store is None:
+        os.makedirs(os.path.dirname(CHAT_CACHE_PATH), exist_ok=True)
+        _chat_store = shelve.open(CHAT_CACHE_PATH)
+    return _chat_store
+
+
+def _get_cached_chat(key):
+    if key not in _chat_memory:
+        store = _open_chat_store()
+        if key not in store:
+            return None
+        _chat_memory[key] = store[key]
+    return _chat_memory[key]
+
+
+def _put_cached_chat(key, content):
+    store = _open_chat_store()
+    store[key] = content
+    store.sync()
+    _chat_memory[key] = content
+
+
+async def cached_chat(messages, validate=None, **params):
+    """
+    Content of a chat completion; an identical earlier request (same messages
+    and params) is answered from cache without calling the API.
+    Only completions that finished normally and pass `validate` (if given) are cached
+    """
+    key = _chat_cache_key(messages, params)
+    content = _get_cached_chat(key)
+    if content is None:
+        resp = await client.chat.completions.create(messages=messages, **params)
+        choice = resp.choices[0]
+        content = choice.message.content
+        if choice.finish_reason == "stop" and (validate is None or validate(content)):
+            _put_cached_chat(key, content)
+    return content
+
+
+async def stream_chat(messages, validate=None, on_complete=None, **params):
+    """
+    Like cached_chat, but yields the completion in pieces as they are generated.
+    A cache hit is yielded as a single piece; a streamed answer is cached once complete.
+    `on_complete(content)` is called only for a fresh answer that is cached
+    (finished with "stop" and passed `validate`)
+    """
+    key = _chat_cache_key(messages, params)
+    content = _get_cached_chat(key)
+    if content is not None:
+        yield content
+        return
+
+    parts = []
+    finish_reason = None
+    stream = await client.chat.completions.create(
+        messages=messages, stream=True, **params
+    )
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+        delta = choice.delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+
+    content = "".join(parts)
+    if finish_reason == "stop" and (validate is None or validate(content)):
+        _put_cached_chat(key, content)
+        if on_complete is not None:
+            on_complete(content)
@@ -1,10 +1,30 @@
-import json
+import logging
+import os
 import re
 
+import numpy as np
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_STORAGE_RE = re.compile(r"([0-9.]+)\s*(TB|GB)", re.I)
+
+# path -> (mtime_ns, parsed data); reloaded only when the file changes on disk
+_CACHE = {}
+# path -> (data it was built from, catalog); rebuilt whenever load_data reloads
+_CATALOGS = {}
+
 
 def load_data(path="data/cloud_storage.json"):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    _CACHE[path] = (mtime, data)
+    return data
 
 
 def parse_storage_to_gb(storage_str):
@@ -14,7 +34,14 @@ def parse_storage_to_gb(storage_str):
     if not storage_str:
         return None
 
-    m = re.match(r"([0-9.]+)\s*(TB|GB)", storage_str, re.I)
+    # Fast path for the dataset's canonical "<number> GB|TB" form
+    num, _, unit = storage_str.rpartition(" ")
+    digits = num.replace(".", "", 1)
+    if unit in ("GB", "TB") and digits.isascii() and digits.isdigit():
+        val = float(num)
+        return val * 1024 if unit == "TB" else val
+
+    m = _STORAGE_RE.match(storage_str)
     if not m:
         return None
 
@@ -24,83 +51,121 @@ def parse_storage_to_gb(storage_str):
     return val * 1024 if unit == "TB" else val
 
 
-def retrieve_info(parsed):
-    data = load_data()
-
-    platform = parsed.get("Platform")
-    price_cond = parsed.get("Price", {})
-    storage_cond = parsed.get("Storage", {})
-    feature = parsed.get("Feature")
-
-    # --- 1) Platform filtering ---
-    if platform:
-        platforms = [p for p in data if p["Platform"] == platform]
-    else:
-        platforms = data[:]  # Search all platforms
-
-    candidates = []
+def build_catalog(data):
+    """
+    Flatten platforms x plans x pricing options into parallel columns,
+    one row per pricing option, so filtering is a few vectorized masks
+    """
+    platforms, plans, options = [], [], []
+    prices, storages, cycles, features = [], [], [], []
 
-    for p in platforms:
+    for p in data:
         for plan in p["Plans"]:
-            # --- 2) storage filtering ---
             st_num = parse_storage_to_gb(plan.get("Storage"))
-            if storage_cond:
-                if storage_cond.get("min") is not None:
-                    if st_num is None or st_num < storage_cond["min"]:
-                        continue
-                if storage_cond.get("max") is not None:
-                    if st_num is None or st_num > storage_cond["max"]:
-                        continue
-
-            # --- 3) feature filtering ---
-            if feature:
-                text = " ".join(plan.get("Features", [])).lower()
-                if feature.lower() not in text:
-                    continue
-
-            # --- 4) price filtering ---
-            valid_pricing = []
+            text = " ".join(plan.get("Features", [])).lower()
             for opt in plan.get("PricingOptions", []):
-                price = float(opt["Price"])
-                cycle = opt.get("PlanType")
+                platforms.append(p["Platform"])
+                plans.append(plan)
+                options.append(opt)
+                prices.append(float(opt["Price"]))
+                storages.append(np.nan if st_num is None else st_num)
+                cycles.append(opt.get("PlanType"))
+                features.append(text)
+
+    platform_col = np.array(platforms, dtype=object)
+    return {
+        "platform": platform_col,
+        "price": np.array(prices, dtype=np.float64),
+        "storage_gb": np.array(storages, dtype=np.float64),
+        "cycle": np.array(cycles, dtype=object),
+        "features": features,
+        "plans": plans,
+        "options": options,
+        # platform name -> row mask, built once
+        "platform_index": {
+            name: platform_col == name for name in dict.fromkeys(platforms)
+        },
+    }
 
-                if price_cond.get("cycle") and cycle != price_cond["cycle"]:
-                    continue
 
-                if price_cond.get("min") is not None and price < price_cond["min"]:
-                    continue
+def load_catalog(path="data/cloud_storage.json"):
+    data = load_data(path)
+    cached = _CATALOGS.get(path)
+    if cached is not None and cached[0] is data:
+        return cached[1]
 
-                if price_cond.get("max") is not None and price > price_cond["max"]:
-                    continue
+    catalog = build_catalog(data)
+    _CATALOGS[path] = (data, catalog)
+    return catalog
 
-                valid_pricing.append(opt)
 
-            if price_cond and not valid_pricing:
-                continue
+def retrieve_info(parsed, catalog=None):
+    if catalog is None:
+        catalog = load_catalog()
 
-            # Use the cheapest matched pricing as sorting basis
-            if valid_pricing:
-                best = min(valid_pricing, key=lambda x: float(x["Price"]))
-            else:
-                best = plan["PricingOptions"][0]
+    platform = parsed.get("Platform")
+    price_cond = parsed.get("Price", {})
+    storage_cond = parsed.get("Storage", {})
+    feature = parsed.get("Feature")
 
-            candidates.append((p["Platform"], plan, best))
+    price = catalog["price"]
+    mask = np.ones(len(price), dtype=bool)
 
-    if not candidates:
+    # --- 1) Platform filtering ---
+    if platform:
+        # e.g. a list of platforms from the parser can't match a single plan
+        if not isinstance(platform, str):
+            return None
+        platform_mask = catalog["platform_index"].get(platform)
+        if platform_mask is None:
+            return None
+        mask &= platform_mask
+
+    # --- 2) storage filtering (unknown sizes are NaN and fail any bound) ---
+    if storage_cond:
+        storage = catalog["storage_gb"]
+        if storage_cond.get("min") is not None:
+            mask &= storage >= storage_cond["min"]
+        if storage_cond.get("max") is not None:
+            mask &= storage <= storage_cond["max"]
+
+    # --- 3) feature filtering ---
+    if feature:
+        if not isinstance(feature, str):
+            return None
+        needle = feature.lower()
+        mask &= np.fromiter(
+            (needle in text for text in catalog["features"]), dtype=bool, count=len(price)
+        )
+
+    # --- 4) price filtering ---
+    if price_cond:
+        cycle = price_cond.get("cycle")
+        if cycle:
+            # e.g. ["Monthly", "Annual"] would broadcast or fail as an array comparison
+            if not isinstance(cycle, str):
+                return None
+            mask &= catalog["cycle"] == cycle
+        if price_cond.get("min") is not None:
+            mask &= price >= price_cond["min"]
+        if price_cond.get("max") is not None:
+            mask &= price <= price_cond["max"]
+
+    # Cheapest matching row; argmin returns the first on ties, preserving data order.
+    # Filtered-out rows are +inf, so an inf minimum means nothing matched
+    masked_price = np.where(mask, price, np.inf)
+    idx = int(np.argmin(masked_price))
+    if np.isinf(masked_price[idx]):
         return None
-
-    # Sort by price in ascending order
-    candidates.sort(key=lambda x: float(x[2]["Price"]))
-
-    platform, plan, opt = candidates[0]
+    plan = catalog["plans"][idx]
     result = {
-        "Platform": platform,
+        "Platform": catalog["platform"][idx],
         "PlanName": plan["PlanName"],
-        "Price": float(opt["Price"]),
-        "PlanType": opt["PlanType"],
+        "Price": float(price[idx]),
+        "PlanType": catalog["options"][idx]["PlanType"],
         "Storage": plan["Storage"],
         "FeatureMatch": parsed.get("Feature"),
     }
 
-    print(f"STEP 3- filtered result → {result}")
-    return result
\ No newline at end of file
+    logger.debug("filtered result → %s", result)
+    return result
@@ -0,0 +1,98 @@
+import re
+
+_PLATFORMS = {
+    "google drive": "Google Drive",
+    "dropbox": "Dropbox",
+    "onedrive": "OneDrive",
+    "box": "Box",
+}
+
+_PLATFORM_RE = re.compile(r"\b(google drive|dropbox|onedrive|box)\b")
+_AMOUNT = r"\s*\$?\s*([0-9]+(?:\.[0-9]+)?)"
+_MAX_PRICE_RE = re.compile(r"(?:\bunder|\bbelow|\bless than|\bat most|<)" + _AMOUNT)
+_MIN_PRICE_RE = re.compile(
+    r"(?:\bover|\babove|\bmore than|\bgreater than|\bat least|>)" + _AMOUNT
+)
+_MONTHLY_RE = re.compile(r"\b(?:monthly|per month|a month|each month)\b")
+_ANNUAL_RE = re.compile(r"\b(?:annual|annually|yearly|per year|a year|each year)\b")
+_WORD_RE = re.compile(r"[a-z0-9']+")
+# "most" alone can start any superlative ("most storage"), so only this phrase is filler
+_FILLER_PHRASE_RE = re.compile(r"\bmost affordable\b")
+
+# Words that carry no filtering condition; anything else sends the question to the LLM
+_FILLER_WORDS = {
+    "a", "an", "the", "is", "are", "do", "does", "what", "what's", "whats", "which",
+    "on", "at", "for", "from", "in", "of", "with", "to", "and",
+    "i", "me", "my", "we", "our", "you", "can", "could", "would", "please",
+    "want", "need", "looking", "look", "find", "show", "give", "tell", "get", "list",
+    "plan", "plans", "option", "options", "subscription", "service", "cloud",
+    "cheapest", "cheap", "cheaper", "lowest", "affordable",
+    "price", "prices", "priced", "pricing", "cost", "costs",
+    "available", "offer", "offers", "there", "any",
+    "billing", "billed", "pay", "paid", "payment", "dollar", "dollars", "usd",
+}
+
+
+def _extract(question):
+    """
+    Split a question into platforms, upper/lower price bounds, billing cycles
+    and the leftover words that carry some other condition
+    """
+    text = question.lower()
+
+    platforms = {_PLATFORMS[m] for m in _PLATFORM_RE.findall(text)}
+    text = _PLATFORM_RE.sub(" ", text)
+
+    max_prices = [float(m) for m in _MAX_PRICE_RE.findall(text)]
+    text = _MAX_PRICE_RE.sub(" ", text)
+    min_prices = [float(m) for m in _MIN_PRICE_RE.findall(text)]
+    text = _MIN_PRICE_RE.sub(" ", text)
+
+    cycles = set()
+    if _MONTHLY_RE.search(text):
+        cycles.add("Monthly")
+    if _ANNUAL_RE.search(text):
+        cycles.add("Annual")
+    text = _ANNUAL_RE.sub(" ", _MONTHLY_RE.sub(" ", text))
+    text = _FILLER_PHRASE_RE.sub(" ", text)
+
+    leftover = set(_WORD_RE.findall(text)) - _FILLER_WORDS
+    return platforms, max_prices, min_prices, cycles, leftover
+
+
+def constraint_key(question):
+    """
+    Canonical string of every condition in the question. Two questions with
+    the same key ask for the same thing, up to filler wording
+    """
+    platforms, max_prices, min_prices, cycles, leftover = _extract(question)
+    tokens = set(platforms) | cycles | leftover
+    tokens.update(f"max:{p}" for p in max_prices)
+    tokens.update(f"min:{p}" for p in min_prices)
+    return ",".join(sorted(tokens))
+
+
+def rule_parse(question):
+    """
+    Deterministic parse for simple questions (platform, price bound, billing cycle).
+    Returns the parse_with_llm schema, or None when any part of the question is
+    not understood so the caller can fall back to the LLM
+    """
+    platforms, max_prices, min_prices, cycles, leftover = _extract(question)
+
+    # Ambiguous (several platforms/bounds/cycles) or leftover conditions need the LLM
+    if max(len(platforms), len(max_prices), len(min_prices), len(cycles)) > 1:
+        return None
+    if leftover:
+        return None
+
+    return {
+        "Platform": platforms.pop() if platforms else None,
+        "Price": {
+            "min": min_prices[0] if min_prices else None,
+            "max": max_prices[0] if max_prices else None,
+            "cycle": cycles.pop() if cycles else None,
+        },
+        "Storage": {"min": None, "max": None},
+        "Feature": None,
+    }
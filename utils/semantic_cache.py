@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from utils.api_client import client
+
+logger = logging.getLogger(__name__)
+
+EMBED_MODEL = "text-embedding-3-small"
+SIMILARITY_THRESHOLD = 0.95
+CACHE_PATH = ".cache/semantic_cache.pkl"
+
+# scope -> {"vectors": (n, dim) array of unit embeddings, "values": [n cached values]}
+_store = None
+# question -> task resolving to its unit embedding, so the parse and answer
+# lookups share one API call even while it is still in flight
+_embeddings = {}
+
+
+def _load_store():
+    global _store
+    if _store is None:
+        try:
+            with open(CACHE_PATH, "rb") as f:
+                _store = pickle.load(f)
+        except FileNotFoundError:
+            _store = {}
+        except Exception as e:
+            # A corrupt or unreadable cache only costs recomputation
+            logger.warning("ignoring unreadable semantic cache %s: %s", CACHE_PATH, e)
+            _store = {}
+    return _store
+
+
+def _save_store():
+    # Write a temp file and swap it in, so a crash mid-write never leaves a torn pickle
+    cache_dir = os.path.dirname(CACHE_PATH)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(_store, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def _fetch_embedding(text):
+    resp = await client.embeddings.create(model=EMBED_MODEL, input=text)
+    vec = np.asarray(resp.data[0].embedding, dtype=np.float32)
+    vec /= np.linalg.norm(vec)
+    return vec
+
+
+async def embed(text):
+    """
+    L2-normalized embedding of `text`, so cosine similarity is a plain dot product
+    """
+    task = _embeddings.get(text)
+    if task is None:
+        task = _embeddings[text] = asyncio.ensure_future(_fetch_embedding(text))
+    try:
+        # One caller being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
+    except Exception:
+        # Failures are not memoized, the next call retries
+        if task.done() and _embeddings.get(text) is task:
+            del _embeddings[text]
+        raise
+
+
+async def try_embed(text):
+    """
+    Like embed, but returns None on failure: the cache is an optimization,
+    so callers carry on as on a cache miss
+    """
+    try:
+        return await embed(text)
+    except Exception as e:
+        logger.warning("embedding failed, skipping the semantic cache: %s", e)
+        return None
+
+
+def lookup(scope, vec):
+    """
+    Return the value cached under `scope` whose embedding is closest to `vec`,
+    or None if nothing reaches SIMILARITY_THRESHOLD
+    """
+    if vec is None:
+        return None
+    entry = _load_store().get(scope)
+    # Entries from an embedding model with another dimension can't be compared
+    if entry is None or entry["vectors"].shape[1] != vec.shape[0]:
+        return None
+
+    sims = entry["vectors"] @ vec
+    best = int(np.argmax(sims))
+    if sims[best] < SIMILARITY_THRESHOLD:
+        return None
+    return entry["values"][best]
+
+
+def insert(scope, vec, value):
+    if vec is None:
+        return
+    store = _load_store()
+    entry = store.get(scope)
+    if entry is None or entry["vectors"].shape[1] != vec.shape[0]:
+        store[scope] = {"vectors": vec[np.newaxis, :], "values": [value]}
+    else:
+        entry["vectors"] = np.vstack([entry["vectors"], vec])
+        entry["values"].append(value)
+    try:
+        _save_store()
+    except OSError as e:
+        # The entry still serves this process; only persistence is lost
+        logger.warning("could not save semantic cache %s: %s", CACHE_PATH, e)
@@ -1,8 +1,21 @@
 import json
-from utils.api_client import client
+import logging
+from utils import semantic_cache
+from utils.api_client import cached_chat
+from utils.rule_parser import constraint_key, rule_parse
 
+logger = logging.getLogger(__name__)
 
-def parse_with_llm(question):
+
+def _is_json(raw):
+    try:
+        json.loads(raw)
+    except Exception:
+        return False
+    return True
+
+
+async def parse_with_llm(question):
     """
     Parse natural language into structured filtering conditions::
     {
@@ -52,27 +65,48 @@ def parse_with_llm(question):
         "- DO NOT invent details.\\n"
     )
 
-    resp = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
+    # Simple questions are parsed by rules, skipping the API entirely
+    parsed = rule_parse(question)
+    if parsed is not None:
+        logger.debug("rule-based parse → %s", parsed)
+        return parsed
+
+    # Paraphrases of an already-parsed question reuse its parse, but only when
+    # all their conditions match (platforms, price bounds, cycle, other content words)
+    scope = "parse:" + constraint_key(question)
+    vec = await semantic_cache.try_embed(question)
+    cached = semantic_cache.lookup(scope, vec)
+    if cached is not None:
+        logger.debug("semantic cache hit → %s", cached)
+        return cached
+
+    raw = await cached_chat(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": question},
         ],
+        model="gpt-3.5-turbo",
+        # JSON mode guarantees a parseable object; temperature 0 makes repeats cache hits
+        response_format={"type": "json_object"},
+        temperature=0,
+        # an unparseable parse must not be cached, or the fallback would stick forever
+        validate=_is_json,
     )
+    logger.debug("raw semantic parse output: %s", raw)
 
-    raw = resp.choices[0].message.content.strip()
-    print(f"DEBUG -raw semantic parse output: {raw}")
-
-    # fallback prevent JSON parsing errors
+    # fallback for output cut off before the object closes (JSON mode can't prevent that)
     try:
         parsed = json.loads(raw)
     except Exception:
+        logger.warning("semantic parse output is not valid JSON: %r", raw)
         parsed = {
             "Platform": None,
             "Price": {"min": None, "max": None, "cycle": None},
             "Storage": {"min": None, "max": None},
             "Feature": None,
         }
+    else:
+        semantic_cache.insert(scope, vec, parsed)
 
-    print(f"STEP 1- semantic parse result → {parsed}")
+    logger.debug("semantic parse result → %s", parsed)
     return parsed